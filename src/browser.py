@@ -1,15 +1,25 @@
 from playwright.sync_api import sync_playwright
 
 class Browser:
-    def __init__(self):
+    def __init__(self, headless=False, user_agent=None):
         self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False)
-        self.context = self.browser.new_context()
+        self.browser = self.playwright.chromium.launch(headless=headless)
+        self.context = self.browser.new_context(user_agent=user_agent)
         self.page = self.context.new_page()
 
     def navigate(self, url):
         self.page.goto(url)
 
+    def new_context_page(self, user_agent=None):
+        """Return a fresh (context, page) pair on the warm browser.
+
+        Contexts are cheap (~50-150ms) compared to a full Chromium launch;
+        callers should close the context when done and keep the browser.
+        """
+        context = self.browser.new_context(user_agent=user_agent)
+        page = context.new_page()
+        return context, page
+
     def close(self):
         self.browser.close()
         self.playwright.stop()
\ No newline at end of file
@@ -12,18 +12,57 @@ Sensitive settings should be placed in a .env file or passed as env vars.
 """
 
 import os
+import re
+import json
 import time
+import base64
+import hashlib
+import asyncio
 import logging
 import argparse
+import functools
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+
+@functools.lru_cache(maxsize=1)
+def _get_sync_playwright():
+    """Import playwright lazily; runs without it (tests) skip the import cost."""
+    try:
+        from playwright.sync_api import sync_playwright
+        return sync_playwright
+    except Exception:  # Playwright may not be installed in test environment
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_async_playwright():
+    try:
+        from playwright.async_api import async_playwright
+        return async_playwright
+    except Exception:
+        return None
+
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-except Exception:  # Playwright may not be installed in test environment
-    sync_playwright = None
-    PlaywrightTimeoutError = Exception
+    import numpy as np
+except Exception:  # numpy is optional; the pure-Python path always works
+    np = None
 
+try:
+    import orjson
+except Exception:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+
+def _dump_json_bytes(obj):
+    """Serialize to indented JSON bytes, via orjson's C encoder when present."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+import queue
 import smtplib
+import threading
 from email.mime.text import MIMEText
 
 # load .env if present
@@ -48,41 +87,203 @@ SLOT_SELECTOR_DEFAULT = os.getenv("SLOT_SELECTOR", "table.table tbody tr")
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
+# Resource types and third-party hosts the scraper never reads; aborting them
+# before download cuts bandwidth and speeds up every wait condition.
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+_BLOCKED_HOSTS = ("google-analytics", "doubleclick", "facebook.net", "hotjar", "gtag")
 
-def send_notification(message):
-    """Send a plain-text email notification.
 
-    This function can be patched in tests.
+def _route_blocker(route):
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(h in request.url for h in _BLOCKED_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _install_request_blocking(page):
+    """Abort analytics/ads and heavy resources; keep HTML/XHR/script.
+
+    Idempotent so the monitor's persistent page doesn't stack handlers.
+    """
+    if getattr(page, "_request_blocking_installed", False):
+        return
+    try:
+        page.route("**/*", _route_blocker)
+        page._request_blocking_installed = True
+    except Exception:
+        logging.debug("Could not install request blocking")
+
+
+# Maps prevision label (lowercased) -> option value; the dropdown is static,
+# so monitor iterations after the first skip the in-browser lookup entirely.
+_PREVISION_CACHE = {}
+
+# Walks all slot rows in-browser and returns plain JSON in a single CDP
+# round-trip instead of ~10 Playwright calls per row.
+_SLOT_EXTRACT_JS = """
+(sel) => Array.from(document.querySelectorAll(sel)).map((el) => {
+    const tds = Array.from(el.querySelectorAll('td'));
+    if (tds.length >= 4) {
+        const data = { doctor: tds[0].innerText.trim(), hora: tds[3].innerText.trim() };
+        const form = el.querySelector('form');
+        if (form) {
+            for (const inp of form.querySelectorAll('input[type=hidden]')) {
+                if (inp.name) data[inp.name] = inp.value;
+            }
+        }
+        return data;
+    }
+    const a = el.querySelector('a');
+    return { text: el.innerText.trim(), href: a ? a.href : null };
+})
+"""
+
+
+# Notifications are queued to a daemon worker so callers never block on SMTP.
+_email_q = queue.Queue()
+_email_worker_started = False
+_email_worker_lock = threading.Lock()
+# persistent SMTP connection shared by all senders, guarded by _smtp_lock
+_smtp_conn = None
+_smtp_lock = threading.Lock()
+
+
+def _connect_smtp():
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30)
+    server.starttls()
+    if EMAIL_PASSWORD:
+        server.login(EMAIL_FROM, EMAIL_PASSWORD)
+    return server
+
+
+def _get_smtp():
+    """Return the cached SMTP connection, (re)connecting when needed.
+
+    Callers must hold _smtp_lock.
     """
+    global _smtp_conn
+    if _smtp_conn is None:
+        _smtp_conn = _connect_smtp()
+    return _smtp_conn
+
+
+def _drop_smtp():
+    """Discard the cached connection so the next send reconnects."""
+    global _smtp_conn
+    try:
+        if _smtp_conn is not None:
+            _smtp_conn.close()
+    except Exception:
+        pass
+    _smtp_conn = None
+
+
+def _send_smtp(message):
+    """Send one message over the cached SMTP connection, reconnecting once."""
     msg = MIMEText(message)
     msg["Subject"] = f"Available Hours"
     msg["From"] = EMAIL_FROM
     msg["To"] = EMAIL_TO
 
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30) as server:
-            server.starttls()
-            if EMAIL_PASSWORD:
-                server.login(EMAIL_FROM, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_FROM, [EMAIL_TO], msg.as_string())
-        logging.info("Notification sent to %s", EMAIL_TO)
-    except Exception:
-        logging.exception("Failed to send notification")
+    with _smtp_lock:
+        for attempt in range(2):
+            try:
+                _get_smtp().sendmail(EMAIL_FROM, [EMAIL_TO], msg.as_string())
+                logging.info("Notification sent to %s", EMAIL_TO)
+                return
+            except Exception:
+                # drop the cached connection; a second attempt gets a fresh one
+                _drop_smtp()
+                if attempt == 1:
+                    logging.exception("Failed to send notification")
+
+
+def _smtp_worker():
+    while True:
+        message = _email_q.get()
+        try:
+            _send_smtp(message)
+        finally:
+            _email_q.task_done()
+
+
+def _ensure_email_worker():
+    global _email_worker_started
+    if _email_worker_started:
+        return
+    with _email_worker_lock:
+        if not _email_worker_started:
+            threading.Thread(target=_smtp_worker, name="smtp-worker", daemon=True).start()
+            _email_worker_started = True
+
+
+def send_notification(message):
+    """Queue a plain-text email notification for the background worker.
+
+    Returns immediately; SMTP latency is hidden from the check loop.
+    This function can be patched in tests.
+    """
+    _ensure_email_worker()
+    _email_q.put(message)
+
+
+def flush_notifications():
+    """Block until all queued notifications have been handed to SMTP."""
+    _email_q.join()
+
+
+# Hash of the last saved failure page; repeated identical failures in monitor
+# mode skip the write entirely instead of filling the disk every tick.
+_last_artifact_hash = None
 
 
 def _save_artifacts(page, prefix="error"):
+    global _last_artifact_hash
     try:
+        # fetch the DOM once; reused below for the HTML artifact
+        try:
+            html = page.content()
+        except Exception:
+            logging.exception("Failed to read page content for artifacts")
+            html = None
+        repeat_failure = False
+        if html is not None:
+            h = hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+            if h == _last_artifact_hash:
+                logging.info("Skipping artifacts: page identical to previous failure")
+                return
+            repeat_failure = _last_artifact_hash is not None
+            _last_artifact_hash = h
+
         os.makedirs(ARTIFACTS_DIR, exist_ok=True)
         ts = int(time.time())
-        screenshot_path = os.path.join(ARTIFACTS_DIR, f"{prefix}_screenshot_{ts}.png")
+        screenshot_path = os.path.join(ARTIFACTS_DIR, f"{prefix}_screenshot_{ts}.jpg")
         html_path = os.path.join(ARTIFACTS_DIR, f"{prefix}_page_{ts}.html")
         try:
-            page.screenshot(path=screenshot_path, full_page=True)
+            # JPEG via CDP with optimizeForSpeed encodes much faster than
+            # Playwright's default lossless full-page PNG
+            cdp = page.context.new_cdp_session(page)
+            try:
+                shot = cdp.send("Page.captureScreenshot", {"format": "jpeg", "quality": 80, "optimizeForSpeed": True})
+                with open(screenshot_path, "wb") as fh:
+                    fh.write(base64.b64decode(shot["data"]))
+            finally:
+                try:
+                    cdp.detach()
+                except Exception:
+                    pass
         except Exception:
-            logging.exception("Failed to save screenshot")
+            logging.exception("CDP screenshot failed; falling back to page.screenshot")
+            try:
+                # viewport-only on repeat failures: full-page PNG is 5-10x larger
+                page.screenshot(path=screenshot_path, full_page=not repeat_failure)
+            except Exception:
+                logging.exception("Failed to save screenshot")
         try:
-            with open(html_path, "w", encoding="utf-8") as fh:
-                fh.write(page.content())
+            if html is not None:
+                with open(html_path, "wb", buffering=1 << 20) as fh:
+                    fh.write(html.encode("utf-8"))
         except Exception:
             logging.exception("Failed to save page HTML")
         logging.info("Saved artifacts: %s, %s", screenshot_path, html_path)
@@ -96,15 +297,16 @@ def _check_with_driver(selector=".available-hour", doctor=DOCTOR_LAST_NAME):
     Returns the user-facing result string.
     """
     global driver
-    # Allow tests to patch driver.find_elements
-    elements = []
+    # one in-browser count instead of N find_elements round-trips
+    # (tests patch driver.execute_script)
+    count = 0
     try:
-        elements = driver.find_elements(selector)
+        count = int(driver.execute_script("return document.querySelectorAll(arguments[0]).length", selector) or 0)
     except Exception:
         logging.exception("Error using patched driver")
 
-    if elements:
-        message = f"Available hours found: {len(elements)} slots."
+    if count:
+        message = f"Available hours found: {count} slots."
         try:
             send_notification(message)
         except Exception:
@@ -114,12 +316,16 @@ def _check_with_driver(selector=".available-hour", doctor=DOCTOR_LAST_NAME):
         return "No available hours."
 
 
-def check_availability(headless=False, timeout=30000, prevision=PREVISION_VALUE, doctor=DOCTOR_LAST_NAME, selector=None, output_json=False, return_slots=False):
+def check_availability(headless=False, timeout=30000, prevision=PREVISION_VALUE, doctor=DOCTOR_LAST_NAME, selector=None, output_json=False, return_slots=False, page=None, browser=None):
     """Check availability and return a human-friendly result string.
 
     Behavior:
       - If a module-level `driver` is set (tests), use it.
-      - Otherwise try to use Playwright (if installed).
+      - If a `page` is provided (e.g. the monitor's long-lived browser),
+        reuse it and only perform navigation + extraction.
+      - If a `browser` (src.browser.Browser) is provided, run in a fresh
+        context on it and close only the context, keeping Chromium warm.
+      - Otherwise try to use Playwright (if installed) with a one-shot browser.
 
     The function updates its attribute `.send_notification` to point to the
     module-level `send_notification` function so tests that patch the
@@ -135,322 +341,452 @@ def check_availability(headless=False, timeout=30000, prevision=PREVISION_VALUE,
     if driver is not None:
         return _check_with_driver(doctor=doctor)
 
+    # Reuse an injected page (persistent browser) and skip launch/teardown
+    if page is not None:
+        try:
+            return _run_page_check(page, timeout=timeout, prevision=prevision, doctor=doctor, selector=selector, output_json=output_json, return_slots=return_slots, suppress_notifications=suppress_notifications, headless=headless)
+        except Exception:
+            logging.exception("Unhandled error in Playwright flow (injected page)")
+            if return_slots:
+                return "No available hours.", []
+            return "No available hours."
+
+    # Reuse a warm Browser instance: fresh context per call, shared Chromium
+    if browser is not None:
+        try:
+            context, ctx_page = browser.new_context_page(user_agent=USER_AGENT)
+            try:
+                return _run_page_check(ctx_page, timeout=timeout, prevision=prevision, doctor=doctor, selector=selector, output_json=output_json, return_slots=return_slots, suppress_notifications=suppress_notifications, headless=headless)
+            finally:
+                try:
+                    context.close()
+                except Exception:
+                    logging.debug("Could not close browser context")
+        except Exception:
+            logging.exception("Unhandled error in Playwright flow (shared browser)")
+            if return_slots:
+                return "No available hours.", []
+            return "No available hours."
+
     # Fallback: use Playwright if available
+    sync_playwright = _get_sync_playwright()
     if sync_playwright is None:
         logging.error("No driver available and Playwright not installed. Exiting.")
         return "No available hours."
 
     logging.info("Running Playwright flow (headless=%s) for %s", headless, doctor)
-    notified = False
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=headless)
             page = browser.new_page(user_agent=USER_AGENT)
-            page.set_default_timeout(timeout)
-            # navigation with retry
-            nav_attempts = int(os.getenv("NAV_ATTEMPTS", "3"))
-            for attempt in range(1, nav_attempts + 1):
-                try:
-                    page.goto(URL, wait_until="networkidle")
-                    break
-                except Exception as e:
-                    logging.warning("Navigation attempt %s/%s failed: %s", attempt, nav_attempts, e)
-                    if attempt == nav_attempts:
-                        # ensure artifacts dir exists
-                        try:
-                            os.makedirs(ARTIFACTS_DIR, exist_ok=True)
-                            ts = int(time.time())
-                            screenshot_path = os.path.join(ARTIFACTS_DIR, f"screenshot_{ts}.png")
-                            html_path = os.path.join(ARTIFACTS_DIR, f"page_{ts}.html")
-                            try:
-                                page.screenshot(path=screenshot_path, full_page=True)
-                            except Exception:
-                                logging.exception("Failed to save screenshot")
-                            try:
-                                with open(html_path, "w", encoding="utf-8") as fh:
-                                    fh.write(page.content())
-                            except Exception:
-                                logging.exception("Failed to save page HTML")
-                            logging.error("Saved artifacts to %s", ARTIFACTS_DIR)
-                        except Exception:
-                            logging.exception("Could not create artifacts directory")
-                        raise
-
-            # 1) Switch to "Búsqueda por médico" tab — prefer text-based selector
             try:
-                # Try clicking by visible text first
+                return _run_page_check(page, timeout=timeout, prevision=prevision, doctor=doctor, selector=selector, output_json=output_json, return_slots=return_slots, suppress_notifications=suppress_notifications, headless=headless)
+            finally:
+                browser.close()
+    except Exception:
+        logging.exception("Unhandled error in Playwright flow")
+        if return_slots:
+            return "No available hours.", []
+        return "No available hours."
+
+
+def _run_page_check(page, timeout=30000, prevision=PREVISION_VALUE, doctor=DOCTOR_LAST_NAME, selector=None, output_json=False, return_slots=False, suppress_notifications=False, headless=False):
+    """Drive an already-open Playwright page through the search flow.
+
+    Does not launch or close any browser; callers own the page lifecycle.
+    """
+    notified = False
+    page.set_default_timeout(timeout)
+    # hard cap on navigation wall-clock so a slow site cannot stall a tick
+    page.set_default_navigation_timeout(20000)
+    # skip blocking when a human may need to see the page (CAPTCHA solve)
+    if headless:
+        _install_request_blocking(page)
+    # navigation with retry
+    nav_attempts = int(os.getenv("NAV_ATTEMPTS", "3"))
+    for attempt in range(1, nav_attempts + 1):
+        try:
+            # domcontentloaded is enough: the wait_for_selector below is the
+            # real readiness gate, and networkidle stalls on analytics beacons
+            page.goto(URL, wait_until="domcontentloaded")
+            break
+        except Exception as e:
+            logging.warning("Navigation attempt %s/%s failed: %s", attempt, nav_attempts, e)
+            if attempt == nav_attempts:
+                # ensure artifacts dir exists
                 try:
-                    page.get_by_text("Búsqueda por médico", exact=True).click()
-                except Exception:
-                    # fallback: click element with aria role 'tab' or id
+                    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+                    ts = int(time.time())
+                    screenshot_path = os.path.join(ARTIFACTS_DIR, f"screenshot_{ts}.png")
+                    html_path = os.path.join(ARTIFACTS_DIR, f"page_{ts}.html")
                     try:
-                        page.locator("#medico-tab").click()
+                        page.screenshot(path=screenshot_path, full_page=True)
                     except Exception:
-                        logging.debug("Could not explicitly click medico tab by text or id; continuing")
-            except Exception:
-                logging.debug("medico tab handling failed")
-
-            # 2) Select prevision option by label (e.g., FONASA)
-            try:
-                # prefer selecting by label; if select has id #prevision use it
-                prevision_sel = "#prevision"
-                try:
-                    # try to find option with the provided label and get its value
-                    opts = page.locator(f"{prevision_sel} option")
-                    count = opts.count()
-                    found_value = None
-                    for i in range(count):
-                        opt = opts.nth(i)
-                        text = opt.inner_text().strip()
-                        if text.lower() == prevision.lower():
-                            found_value = opt.get_attribute("value")
-                            break
-                    if found_value:
-                        page.select_option(prevision_sel, value=found_value)
-                    else:
-                        # fallback: try select_option by label directly
-                        try:
-                            page.select_option(prevision_sel, label=prevision)
-                        except Exception:
-                            logging.debug("Could not select prevision by label/value")
+                        logging.exception("Failed to save screenshot")
+                    try:
+                        with open(html_path, "w", encoding="utf-8") as fh:
+                            fh.write(page.content())
+                    except Exception:
+                        logging.exception("Failed to save page HTML")
+                    logging.error("Saved artifacts to %s", ARTIFACTS_DIR)
                 except Exception:
-                    logging.debug("Prevision select not found via #prevision")
-            except Exception:
-                logging.debug("prevision handling failed")
+                    logging.exception("Could not create artifacts directory")
+                raise
 
-            # 3) Fill Apellido Médico field
-            try:
-                # try common selectors / placeholder text
-                apellido_locator = None
+    # 1) Switch to "Búsqueda por médico" tab — a composed locator resolves to
+    # whichever variant exists in a single short wait, instead of serial
+    # fallbacks each burning the full default timeout
+    try:
+        tab = page.get_by_text("Búsqueda por médico", exact=True).or_(page.locator("#medico-tab"))
+        tab.first.click(timeout=5000)
+    except Exception:
+        logging.debug("Could not click medico tab by text or id; continuing")
+
+    # 2) Select prevision option by label (e.g., FONASA)
+    try:
+        # prefer selecting by label; if select has id #prevision use it
+        prevision_sel = "#prevision"
+        try:
+            # find the option value in one in-browser pass; the dropdown never
+            # changes, so reuse the value across monitor iterations
+            found_value = _PREVISION_CACHE.get(prevision.lower())
+            if found_value is None:
+                found_value = page.evaluate(
+                    "([sel, label]) => { const o = [...document.querySelectorAll(sel)].find(x => x.innerText.trim().toLowerCase() === label.toLowerCase()); return o ? o.value : null; }",
+                    [f"{prevision_sel} option", prevision],
+                )
+                if found_value:
+                    _PREVISION_CACHE[prevision.lower()] = found_value
+            if found_value:
+                page.select_option(prevision_sel, value=found_value)
+            else:
+                # fallback: try select_option by label directly
                 try:
-                    apellido_locator = page.get_by_placeholder("Ingresar Apellido")
-                    apellido_locator.fill(doctor)
+                    page.select_option(prevision_sel, label=prevision)
                 except Exception:
-                    try:
-                        apellido_locator = page.locator("#apellido")
-                        apellido_locator.fill(doctor)
-                    except Exception:
-                        # try by label
-                        try:
-                            apellido_locator = page.get_by_label("Apellido Médico")
-                            apellido_locator.fill(doctor)
-                        except Exception:
-                            logging.debug("Could not fill apellido via placeholder, id, or label")
-            except Exception:
-                logging.debug("apellido field handling failed")
+                    logging.debug("Could not select prevision by label/value")
+        except Exception:
+            logging.debug("Prevision select not found via #prevision")
+    except Exception:
+        logging.debug("prevision handling failed")
+
+    # 3) Fill Apellido Médico field — same composed-locator trick
+    apellido_locator = None
+    try:
+        apellido_locator = page.get_by_placeholder("Ingresar Apellido").or_(page.locator("#apellido")).or_(page.get_by_label("Apellido Médico")).first
+        apellido_locator.fill(doctor, timeout=5000)
+    except Exception:
+        apellido_locator = None
+        logging.debug("Could not fill apellido via placeholder, id, or label")
+
+    # 4) Click "Buscar horas" button
+    try:
+        buscar = page.get_by_text("Buscar horas", exact=True).or_(page.get_by_role("button", name="Buscar horas"))
+        buscar.first.click(timeout=5000)
+    except Exception:
+        logging.debug("Could not click Buscar horas by text or role")
 
-            # 4) Click "Buscar horas" button
+    # If we filled the apellido_locator, try pressing Enter on it to submit
+    try:
+        submitted = False
+        if 'apellido_locator' in locals() and apellido_locator is not None:
             try:
+                apellido_locator.press("Enter")
+                submitted = True
+            except Exception:
+                logging.debug("Could not press Enter on apellido locator; will try alternate submit methods")
                 try:
-                    page.get_by_text("Buscar horas", exact=True).click()
+                    apellido_locator.focus()
+                    page.keyboard.press("Enter")
+                    submitted = True
                 except Exception:
-                    # fallback to button role
-                    try:
-                        page.get_by_role("button", name="Buscar horas").click()
-                    except Exception:
-                        logging.debug("Could not click Buscar horas by text or role")
-            except Exception:
-                logging.debug("buscar horas click failed")
+                    logging.debug("Could not focus/press Enter on apellido locator")
 
-            # If we filled the apellido_locator, try pressing Enter on it to submit
-            try:
-                submitted = False
-                if 'apellido_locator' in locals() and apellido_locator is not None:
-                    try:
-                        apellido_locator.press("Enter")
-                        submitted = True
-                    except Exception:
-                        logging.debug("Could not press Enter on apellido locator; will try alternate submit methods")
+        # If not submitted yet, try several common selectors and techniques
+        if not submitted:
+            tried_selectors = ["#apellido", "input[placeholder*='Apellido']", "input[name*='apellido']"]
+            for try_sel in tried_selectors:
+                try:
+                    el = page.query_selector(try_sel)
+                    if el:
                         try:
-                            apellido_locator.focus()
-                            page.keyboard.press("Enter")
+                            el.press("Enter")
                             submitted = True
+                            break
                         except Exception:
-                            logging.debug("Could not focus/press Enter on apellido locator")
-
-                # If not submitted yet, try several common selectors and techniques
-                if not submitted:
-                    tried_selectors = ["#apellido", "input[placeholder*='Apellido']", "input[name*='apellido']"]
-                    for try_sel in tried_selectors:
-                        try:
-                            el = page.query_selector(try_sel)
-                            if el:
-                                try:
-                                    el.press("Enter")
-                                    submitted = True
-                                    break
-                                except Exception:
-                                    try:
-                                        el.focus()
-                                        page.keyboard.press("Enter")
-                                        submitted = True
-                                        break
-                                    except Exception:
-                                        continue
-                        except Exception:
-                            continue
+                            try:
+                                el.focus()
+                                page.keyboard.press("Enter")
+                                submitted = True
+                                break
+                            except Exception:
+                                continue
+                except Exception:
+                    continue
 
-                # Final fallback: try to submit the first form on the page via JS
-                if not submitted:
-                    try:
-                        page.evaluate("() => { const f = document.querySelector('form'); if(f){ f.submit(); return true } return false }")
-                        submitted = True
-                    except Exception:
-                        logging.debug("Final JS form.submit() fallback failed")
+        # Final fallback: try to submit the first form on the page via JS
+        if not submitted:
+            try:
+                page.evaluate("() => { const f = document.querySelector('form'); if(f){ f.submit(); return true } return false }")
+                submitted = True
             except Exception:
-                logging.debug("press Enter handling failed")
+                logging.debug("Final JS form.submit() fallback failed")
+    except Exception:
+        logging.debug("press Enter handling failed")
 
-            if not headless:
-                logging.info("Running non-headless: pause to allow CAPTCHA solve if needed")
-                input("Solve the CAPTCHA (if any) then press Enter to continue...")
-            else:
-                logging.info("Headless mode: if page requires CAPTCHA the automation may fail")
+    if not headless:
+        logging.info("Running non-headless: pause to allow CAPTCHA solve if needed")
+        input("Solve the CAPTCHA (if any) then press Enter to continue...")
+    else:
+        logging.info("Headless mode: if page requires CAPTCHA the automation may fail")
 
-            # submit
-            try:
+    # submit — wait on the actual search response instead of a fixed sleep
+    try:
+        clicked = False
+        try:
+            with page.expect_response(lambda r: "buscar" in r.url.lower() and r.status == 200, timeout=10000) as resp_info:
                 page.click("button[data-callback='onSubmitDoctor']")
+                clicked = True
+            resp_info.value.finished()
+        except Exception:
+            if not clicked:
+                raise
+            logging.debug("Submit clicked but no matching search response observed")
+    except Exception:
+        logging.debug("Submit button click failed, attempting Enter key on #apellido")
+        try:
+            page.press("#apellido", "Enter")
+        except Exception:
+            logging.exception("Could not submit form")
+            try:
+                _save_artifacts(page, prefix="submit_failure")
             except Exception:
-                logging.debug("Submit button click failed, attempting Enter key on #apellido")
-                try:
-                    page.press("#apellido", "Enter")
-                except Exception:
-                    logging.exception("Could not submit form")
-                    try:
-                        _save_artifacts(page, prefix="submit_failure")
-                    except Exception:
-                        logging.exception("Failed saving artifacts on submit failure")
+                logging.exception("Failed saving artifacts on submit failure")
 
-            time.sleep(1)
+    # determine selector (CLI arg > ENV > default). Ensure it's never empty.
+    sel = selector if selector else (SLOT_SELECTOR_DEFAULT or "table.table tbody tr")
 
-            # determine selector (CLI arg > ENV > default). Ensure it's never empty.
-            sel = selector if selector else (SLOT_SELECTOR_DEFAULT or "table.table tbody tr")
+    # wait for container or selector if possible
+    try:
+        page.wait_for_selector(sel, timeout=5000)
+    except Exception:
+        logging.debug("Selector %s not present after wait; proceeding to query", sel)
 
-            # wait for container or selector if possible
+    slots = []
+    try:
+        # single in-browser pass: one CDP round-trip for all rows
+        slots = page.evaluate(_SLOT_EXTRACT_JS, sel) or []
+        # parse each hora once at scrape time so later lookups never re-parse
+        for s in slots:
+            hora = s.get("HORA") or s.get("hora") or s.get("PROXIMA")
+            if hora:
+                s["_hora_dt"] = _parse_slot_datetime(hora)
+    except Exception:
+        logging.exception("Error querying slots with selector %s", sel)
+        # degraded but still batched fallback: one evaluate_all hop that only
+        # grabs text/href, instead of reverting to per-element round-trips
+        try:
+            raw = page.locator(sel).evaluate_all(
+                "els => els.map(e => { const a = e.querySelector('a'); return { text: e.innerText.trim(), href: a ? a.href : null }; })"
+            )
+            slots = [dict(r) for r in raw or []]
+        except Exception:
+            logging.debug("evaluate_all fallback failed for selector %s", sel)
+        try:
+            _save_artifacts(page, prefix="slots_query_failure")
+        except Exception:
+            logging.exception("Failed saving artifacts on slots query failure")
+
+    if slots:
+        message = f"Available hours found: {len(slots)} slots."
+        # write JSON if requested
+        if output_json:
             try:
-                page.wait_for_selector(sel, timeout=5000)
+                os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+                ts = int(time.time())
+                out_path = os.path.join(ARTIFACTS_DIR, f"slots_{ts}.json")
+
+                # strip private fields (e.g. the parsed _hora_dt datetime)
+                plain_slots = [{k: v for k, v in s.items() if not k.startswith("_")} for s in slots]
+                # grouped index lets consumers look up one doctor without
+                # scanning the flat list
+                by_doctor = {}
+                for s in plain_slots:
+                    name = s.get("doctor")
+                    if name:
+                        by_doctor.setdefault(name, []).append(s)
+                with open(out_path, "wb", buffering=1 << 20) as fh:
+                    fh.write(_dump_json_bytes({"doctor": doctor, "slots": plain_slots, "slots_by_doctor": by_doctor, "url": URL}))
+                logging.info("Saved slots JSON to %s", out_path)
             except Exception:
-                logging.debug("Selector %s not present after wait; proceeding to query", sel)
+                logging.exception("Failed to write slots JSON")
 
-            slots = []
+        # If a target doctor is requested via env or CLI, try to find their next slot
+        target_doctor = os.getenv("TARGET_DOCTOR")
+        # the function caller may override via passing doctor param; keep a separate target
+        if target_doctor and not notified:
             try:
-                elements = page.query_selector_all(sel)
-                for el in elements:
-                    try:
-                        # If this is a table row, extract tds
-                        tds = el.query_selector_all("td")
-                        if tds and len(tds) >= 4:
-                            doctor_text = tds[0].inner_text().strip()
-                            hora_text = tds[3].inner_text().strip()
-                            # try to find a form and hidden inputs
-                            form = el.query_selector("form")
-                            data = {"doctor": doctor_text, "hora": hora_text}
-                            if form:
-                                try:
-                                    inputs = form.query_selector_all("input[type=hidden]")
-                                    for inp in inputs:
-                                        name = inp.get_attribute("name")
-                                        value = inp.get_attribute("value")
-                                        if name:
-                                            data[name] = value
-                                except Exception:
-                                    logging.debug("Could not read hidden inputs from form")
-                            slots.append(data)
-                            continue
-                        # fallback: treat as generic element
-                        try:
-                            text = el.inner_text().strip()
-                        except Exception:
-                            text = ""
-                        href = None
-                        try:
-                            link = el.query_selector("a")
-                            if link:
-                                href = link.get_attribute("href")
-                        except Exception:
-                            href = None
-                        slots.append({"text": text, "href": href})
-                    except Exception:
-                        logging.debug("Error extracting data for one slot element")
+                # default max days
+                max_days = int(os.getenv("MAX_DAYS", "30"))
+                next_slot = find_next_slot(slots, target_doctor, max_days)
+                if next_slot:
+                    message = f"Next slot for {target_doctor} within {max_days} days: {next_slot.get('hora')}"
+                    if not suppress_notifications:
+                        send_notification(message)
+                    notified = True
             except Exception:
-                logging.exception("Error querying slots with selector %s", sel)
-                try:
-                    _save_artifacts(page, prefix="slots_query_failure")
-                except Exception:
-                    logging.exception("Failed saving artifacts on slots query failure")
+                logging.exception("Error while checking target doctor next slot")
 
-            if slots:
-                message = f"Available hours found: {len(slots)} slots."
-                # write JSON if requested
-                if output_json:
-                    try:
-                        os.makedirs(ARTIFACTS_DIR, exist_ok=True)
-                        ts = int(time.time())
-                        out_path = os.path.join(ARTIFACTS_DIR, f"slots_{ts}.json")
-                        import json
-
-                        with open(out_path, "w", encoding="utf-8") as fh:
-                            json.dump({"doctor": doctor, "slots": slots, "url": URL}, fh, ensure_ascii=False, indent=2)
-                        logging.info("Saved slots JSON to %s", out_path)
-                    except Exception:
-                        logging.exception("Failed to write slots JSON")
+        try:
+            if not notified:
+                if not suppress_notifications:
+                    send_notification(message)
+                notified = True
+        except Exception:
+            logging.exception("Failed to send notification")
+        if return_slots:
+            return message, slots
+        return message
+    else:
+        if return_slots:
+            return "No available hours.", []
+        return "No available hours."
 
-                # If a target doctor is requested via env or CLI, try to find their next slot
-                target_doctor = os.getenv("TARGET_DOCTOR")
-                # the function caller may override via passing doctor param; keep a separate target
-                if target_doctor and not notified:
-                    try:
-                        # default max days
-                        max_days = int(os.getenv("MAX_DAYS", "30"))
-                        next_slot = find_next_slot(slots, target_doctor, max_days)
-                        if next_slot:
-                            message = f"Next slot for {target_doctor} within {max_days} days: {next_slot.get('hora')}"
-                            if not suppress_notifications:
-                                send_notification(message)
-                            notified = True
-                    except Exception:
-                        logging.exception("Error while checking target doctor next slot")
 
+def check_availability_many(doctors, max_concurrency=5, timeout=30000, prevision=PREVISION_VALUE, selector=None, headless=True):
+    """Check several doctors concurrently; returns {doctor: slots}.
+
+    Shares one Chromium instance across tasks (one context per doctor) and
+    bounds concurrency with a semaphore so K doctors cost roughly
+    ceil(K / max_concurrency) navigations of wall-clock instead of K.
+    """
+    if _get_async_playwright() is None:
+        logging.error("Playwright async API not available; cannot run concurrent checks")
+        return {d: [] for d in doctors}
+    return asyncio.run(_check_many_async(list(doctors), max_concurrency, timeout, prevision, selector, headless))
+
+
+async def _check_many_async(doctors, max_concurrency, timeout, prevision, selector, headless):
+    sel = selector if selector else (SLOT_SELECTOR_DEFAULT or "table.table tbody tr")
+    async_playwright = _get_async_playwright()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        sem = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(
+            *[_check_one_async(browser, d, sem, timeout, prevision, sel) for d in doctors],
+            return_exceptions=True,
+        )
+        await browser.close()
+    out = {}
+    for d, r in zip(doctors, results):
+        if isinstance(r, Exception):
+            logging.error("Concurrent check failed for %s: %s", d, r)
+            out[d] = []
+        else:
+            out[d] = r
+    return out
+
+
+async def _check_one_async(browser, doctor, sem, timeout, prevision, sel):
+    async with sem:
+        ctx = await browser.new_context(user_agent=USER_AGENT)
+        page = await ctx.new_page()
+        try:
+            page.set_default_timeout(timeout)
+            page.set_default_navigation_timeout(20000)
+            await page.goto(URL, wait_until="domcontentloaded")
+            try:
+                await page.get_by_text("Búsqueda por médico", exact=True).click()
+            except Exception:
+                logging.debug("Could not click medico tab for %s", doctor)
+            try:
+                value = _PREVISION_CACHE.get(prevision.lower())
+                if value is None:
+                    value = await page.evaluate(
+                        "([sel, label]) => { const o = [...document.querySelectorAll(sel)].find(x => x.innerText.trim().toLowerCase() === label.toLowerCase()); return o ? o.value : null; }",
+                        ["#prevision option", prevision],
+                    )
+                    if value:
+                        _PREVISION_CACHE[prevision.lower()] = value
+                if value:
+                    await page.select_option("#prevision", value=value)
+            except Exception:
+                logging.debug("Prevision selection failed for %s", doctor)
+            try:
+                await page.fill("#apellido", doctor)
+            except Exception:
+                logging.debug("Could not fill apellido for %s", doctor)
+            try:
+                await page.click("button[data-callback='onSubmitDoctor']")
+            except Exception:
                 try:
-                    if not notified:
-                        if not suppress_notifications:
-                            send_notification(message)
-                        notified = True
+                    await page.press("#apellido", "Enter")
                 except Exception:
-                    logging.exception("Failed to send notification")
-                browser.close()
-                if return_slots:
-                    return message, slots
-                return message
-            else:
-                browser.close()
-                if return_slots:
-                    return "No available hours.", []
-                return "No available hours."
-    except Exception:
-        logging.exception("Unhandled error in Playwright flow")
-        return "No available hours."
+                    logging.debug("Could not submit form for %s", doctor)
+            try:
+                await page.wait_for_selector(sel, timeout=5000)
+            except Exception:
+                logging.debug("Selector %s not present for %s; querying anyway", sel, doctor)
+            return await page.evaluate(_SLOT_EXTRACT_JS, sel) or []
+        finally:
+            await ctx.close()
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_slot_datetime(hora_str):
-    # expects 'dd/mm/YYYY HH:MM'
+    # expects 'dd/mm/YYYY HH:MM'; memoized because the same hora strings
+    # recur across slots, monitor ticks and CI runs sharing state
+    # (string hash + dict lookup is far cheaper than strptime)
     try:
-        from datetime import datetime
         # parse naive datetime from site
         dt = datetime.strptime(hora_str, "%d/%m/%Y %H:%M")
-        # attach site timezone
+    except Exception:
+        # ISO-8601 strings (e.g. values round-tripped through state files)
+        # take the C-accelerated fromisoformat path
         try:
-            from zoneinfo import ZoneInfo
-            site_tz = os.getenv("SITE_TZ", "America/Santiago")
-            return dt.replace(tzinfo=ZoneInfo(site_tz))
+            dt = datetime.fromisoformat(hora_str)
         except Exception:
+            return None
+        if dt.tzinfo is not None:
             return dt
+    # attach site timezone
+    try:
+        from zoneinfo import ZoneInfo
+        site_tz = os.getenv("SITE_TZ", "America/Santiago")
+        return dt.replace(tzinfo=ZoneInfo(site_tz))
+    except Exception:
+        return dt
+
+
+# Below this size the pure-Python loop beats numpy's array-setup overhead
+_NUMPY_MIN_SLOTS = 512
+
+
+def _slot_timestamp(s):
+    dt = s.get("_hora_dt")
+    if not isinstance(dt, datetime):
+        hora = s.get("HORA") or s.get("hora") or s.get("PROXIMA")
+        dt = _parse_slot_datetime(hora) if hora else None
+    try:
+        return dt.timestamp() if dt else None
     except Exception:
         return None
 
 
+def _find_next_slot_numpy(slots, target_doctor, now, cutoff):
+    """Vectorized filter + argmin over slot arrays; returns a slot or None."""
+    doctors = np.array([s.get("doctor", "") or "" for s in slots], dtype=str)
+    ts = np.array([_slot_timestamp(s) or np.nan for s in slots], dtype=np.float64)
+    mask = np.char.find(np.char.lower(doctors), target_doctor.lower()) >= 0
+    mask &= ~np.isnan(ts) & (ts > now.timestamp()) & (ts <= cutoff.timestamp())
+    if not mask.any():
+        return None
+    idx = np.flatnonzero(mask)
+    return slots[int(idx[np.argmin(ts[mask])])]
+
+
 def find_next_slot(slots, target_doctor, max_days=30):
     """Return the nearest slot for target_doctor within max_days, or None."""
-    from datetime import datetime, timedelta
     # use site timezone when available
     try:
         from zoneinfo import ZoneInfo
@@ -459,21 +795,61 @@ def find_next_slot(slots, target_doctor, max_days=30):
     except Exception:
         now = datetime.now()
     cutoff = now + timedelta(days=max_days)
+    # vectorized path pays off only once the slot list gets large
+    if np is not None and len(slots) >= _NUMPY_MIN_SLOTS:
+        try:
+            return _find_next_slot_numpy(slots, target_doctor, now, cutoff)
+        except Exception:
+            logging.debug("numpy slot filter failed; using pure-Python path")
+    # one compiled case-insensitive pattern instead of .lower() per slot
+    pat = re.compile(re.escape(target_doctor), re.IGNORECASE)
     candidates = []
-    td_lower = target_doctor.lower()
     for s in slots:
-        doc = s.get("doctor", "").lower()
-        if td_lower in doc:
-            hora = s.get("HORA") or s.get("hora") or s.get("PROXIMA") or s.get("PROXIMA")
-            dt = None
-            if hora:
-                dt = _parse_slot_datetime(hora)
-            if dt and now < dt <= cutoff:
-                candidates.append((dt, s))
+        if not pat.search(s.get("doctor", "")):
+            continue
+        # prefer the datetime parsed at scrape time; re-parse only for
+        # slots that came from JSON round-trips without it
+        dt = s.get("_hora_dt")
+        if not isinstance(dt, datetime):
+            hora = s.get("HORA") or s.get("hora") or s.get("PROXIMA")
+            dt = _parse_slot_datetime(hora) if hora else None
+        if dt and now < dt <= cutoff:
+            candidates.append((dt, s))
     if not candidates:
         return None
-    candidates.sort(key=lambda x: x[0])
-    return candidates[0][1]
+    # single O(N) pass; no need to sort the whole candidate list
+    return min(candidates, key=lambda x: x[0])[1]
+
+
+def find_next_slot_iter(slots_iter, target_doctor, max_days=30):
+    """Like find_next_slot but over an iterable, holding one slot at a time.
+
+    Consumes the whole stream tracking the minimum in-window datetime, so
+    it gives the same answer as find_next_slot on unsorted input (the
+    scraped table is in DOM order, not time order) while keeping O(1)
+    memory instead of materializing the list.
+    """
+    try:
+        from zoneinfo import ZoneInfo
+        site_tz = os.getenv("SITE_TZ", "America/Santiago")
+        now = datetime.now(ZoneInfo(site_tz))
+    except Exception:
+        now = datetime.now()
+    cutoff = now + timedelta(days=max_days)
+    pat = re.compile(re.escape(target_doctor), re.IGNORECASE)
+    best = None
+    best_dt = None
+    for s in slots_iter:
+        if not pat.search(s.get("doctor", "")):
+            continue
+        dt = s.get("_hora_dt")
+        if not isinstance(dt, datetime):
+            hora = s.get("HORA") or s.get("hora") or s.get("PROXIMA")
+            dt = _parse_slot_datetime(hora) if hora else None
+        if dt and now < dt <= cutoff and (best_dt is None or dt < best_dt):
+            best = s
+            best_dt = dt
+    return best
 
 
 if __name__ == "__main__":
@@ -485,13 +861,6 @@ if __name__ == "__main__":
     parser.add_argument("--output-json", action="store_true", help="Save found slots to JSON in ARTIFACTS_DIR")
     parser.add_argument("--target-doctor", default=None, help="Only notify if this doctor's next slot is within max-days")
     parser.add_argument("--max-days", type=int, default=None, help="Max days ahead to consider for target doctor")
-    args = parser.parse_args()
-
-    # export target doctor / max days to env so the core logic can read them
-    if args.target_doctor:
-        os.environ["TARGET_DOCTOR"] = args.target_doctor
-    if args.max_days is not None:
-        os.environ["MAX_DAYS"] = str(args.max_days)
     parser.add_argument("--monitor", action="store_true", help="Run in monitor mode and check periodically")
     parser.add_argument("--interval-seconds", type=int, default=300, help="Interval between checks when monitoring")
     parser.add_argument("--state-file", default=os.path.join(ARTIFACTS_DIR, "state.json"), help="Path to state file for last-known slots")
@@ -506,7 +875,6 @@ if __name__ == "__main__":
     def load_state(path):
         try:
             if os.path.exists(path):
-                import json
 
                 with open(path, "r", encoding="utf-8") as fh:
                     return json.load(fh)
@@ -517,10 +885,9 @@ if __name__ == "__main__":
     def save_state(path, data):
         try:
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            import json
 
-            with open(path, "w", encoding="utf-8") as fh:
-                json.dump(data, fh, ensure_ascii=False, indent=2)
+            with open(path, "wb", buffering=1 << 20) as fh:
+                fh.write(_dump_json_bytes(data))
         except Exception:
             logging.exception("Failed to save state file")
 
@@ -533,14 +900,56 @@ if __name__ == "__main__":
 
         state = load_state(args.state_file)
         logging.info("Starting monitor mode (interval=%ss) - statefile=%s", args.interval_seconds, args.state_file)
+
+        # Launch one long-lived browser for the whole monitor session instead
+        # of paying a Chromium cold start (~1-2s) on every tick.
+        monitor_browser = None
+        if _get_sync_playwright() is not None:
+            try:
+                try:
+                    from src.browser import Browser
+                except Exception:
+                    from browser import Browser
+                monitor_browser = Browser(headless=args.headless, user_agent=USER_AGENT)
+            except Exception:
+                logging.exception("Could not start persistent browser; falling back to per-tick launch")
+                monitor_browser = None
+
+        # hoist per-tick constants out of the loop: env lookups never change
+        # mid-run and re-parsing the same saved hora every tick is waste
+        monitor_target = args.target_doctor or os.getenv("TARGET_DOCTOR")
+        monitor_max_days = int(os.getenv("MAX_DAYS", "30"))
+        # "target|hora" keys already notified; suppresses duplicate emails
+        # when the site flaps the same slot with spacing/casing differences
+        seen_notifications = set(state.get("_seen_notifications", []))
+
         try:
             while True:
+                # a long-lived Chromium can crash mid-run; relaunch it so a
+                # days-long monitor recovers instead of failing every tick
+                if monitor_browser is not None:
+                    try:
+                        healthy = monitor_browser.browser.is_connected() and not monitor_browser.page.is_closed()
+                    except Exception:
+                        healthy = False
+                    if not healthy:
+                        logging.warning("Persistent browser is gone; relaunching")
+                        try:
+                            monitor_browser.close()
+                        except Exception:
+                            logging.debug("Could not close dead browser")
+                        try:
+                            monitor_browser = Browser(headless=args.headless, user_agent=USER_AGENT)
+                        except Exception:
+                            logging.exception("Could not relaunch persistent browser; falling back to per-tick launch")
+                            monitor_browser = None
+
                 # get slots and prefer returning slots for local comparison
-                res, slots = check_availability(headless=args.headless, prevision=args.prevision, doctor=args.doctor, selector=args.selector, output_json=args.output_json, return_slots=True)
+                res, slots = check_availability(headless=args.headless, prevision=args.prevision, doctor=args.doctor, selector=args.selector, output_json=args.output_json, return_slots=True, page=monitor_browser.page if monitor_browser else None)
 
-                target = args.target_doctor or os.getenv("TARGET_DOCTOR")
+                target = monitor_target
                 if target:
-                    next_slot = find_next_slot(slots, target, int(os.getenv("MAX_DAYS", "30")))
+                    next_slot = find_next_slot(slots, target, monitor_max_days)
                     if next_slot:
                         saved = state.get(target)
                         # compare saved hora string
@@ -548,25 +957,50 @@ if __name__ == "__main__":
                         prev_hora = None
                         if saved:
                             prev_hora = saved.get("hora")
-                            saved_dt = _parse_slot_datetime(prev_hora) if prev_hora else None
+                            if prev_hora:
+                                # _parse_slot_datetime is lru-cached, so the
+                                # repeat parse per tick is already a dict hit
+                                saved_dt = _parse_slot_datetime(prev_hora)
                         new_dt = _parse_slot_datetime(next_slot.get("HORA") or next_slot.get("hora") or next_slot.get("PROXIMA"))
                         if new_dt and (not saved_dt or new_dt < saved_dt):
-                            # newer (closer) slot found
-                            msg = f"Slot freed for {target}: {next_slot.get('HORA') or next_slot.get('hora')}. Previously: {prev_hora}"
-                            send_notification(msg)
-                            # update state
-                            state[target] = {"hora": next_slot.get("HORA") or next_slot.get("hora"), "raw": next_slot}
-                            save_state(args.state_file, state)
+                            new_hora = next_slot.get("HORA") or next_slot.get("hora")
+                            norm_hora = re.sub(r"\s+", " ", (new_hora or "").strip()).lower()
+                            seen_key = f"{target}|{norm_hora}"
+                            if seen_key in seen_notifications:
+                                logging.info("Duplicate slot for %s (%s); notification suppressed", target, new_hora)
+                            else:
+                                # newer (closer) slot found
+                                msg = f"Slot freed for {target}: {new_hora}. Previously: {prev_hora}"
+                                send_notification(msg)
+                                seen_notifications.add(seen_key)
+                                # update state (drop private fields like _hora_dt
+                                # that do not serialize to JSON)
+                                state[target] = {"hora": new_hora, "raw": {k: v for k, v in next_slot.items() if not k.startswith("_")}}
+                                state["_seen_notifications"] = sorted(seen_notifications)
+                                save_state(args.state_file, state)
                         else:
                             logging.info("No nearer slot for %s (found %s, saved %s)", target, new_dt, saved_dt)
                 else:
                     logging.info("Monitor run completed, no TARGET_DOCTOR set")
 
+                # keep the browser warm but start the next tick from a clean slate
+                if monitor_browser is not None:
+                    try:
+                        monitor_browser.context.clear_cookies()
+                    except Exception:
+                        logging.debug("Could not clear cookies between iterations")
+
                 time.sleep(args.interval_seconds)
         except KeyboardInterrupt:
             logging.info("Monitor stopped by user")
         except Exception:
             logging.exception("Monitor loop failed")
+        finally:
+            if monitor_browser is not None:
+                try:
+                    monitor_browser.close()
+                except Exception:
+                    logging.debug("Could not close persistent browser")
         exit(0)
 
     result = check_availability(
@@ -1,12 +1,13 @@
 import pytest
-from src.checker import check_availability
+from datetime import datetime, timedelta
+from src.checker import check_availability, find_next_slot
 
 def test_check_availability(mocker):
     mocker.patch('src.checker.send_notification')
     mocker.patch('src.checker.driver')
     
     # Simulate available hours
-    mocker.patch('src.checker.driver.find_elements', return_value=['slot1', 'slot2'])
+    mocker.patch('src.checker.driver.execute_script', return_value=2)
     
     result = check_availability()
     
@@ -18,9 +19,22 @@ def test_no_available_hours(mocker):
     mocker.patch('src.checker.driver')
     
     # Simulate no available hours
-    mocker.patch('src.checker.driver.find_elements', return_value=[])
+    mocker.patch('src.checker.driver.execute_script', return_value=0)
     
     result = check_availability()
-    
+
     assert result == "No available hours."
-    assert not check_availability.send_notification.called
\ No newline at end of file
+    assert not check_availability.send_notification.called
+
+def test_find_next_slot_picks_nearest(mocker):
+    mocker.patch.dict('os.environ', {'SITE_TZ': 'invalid/so-naive-datetimes-are-used'})
+    soon = datetime.now() + timedelta(days=2)
+    later = datetime.now() + timedelta(days=5)
+    slots = [
+        {"doctor": "DR. ALVAREZ PEREZ", "hora": later.strftime("%d/%m/%Y %H:%M")},
+        {"doctor": "Dr. Alvarez Perez", "hora": soon.strftime("%d/%m/%Y %H:%M")},
+        {"doctor": "Dra. Soto", "hora": soon.strftime("%d/%m/%Y %H:%M")},
+    ]
+    result = find_next_slot(slots, "alvarez", max_days=30)
+    assert result is not None
+    assert result["hora"] == soon.strftime("%d/%m/%Y %H:%M")
\ No newline at end of file
@@ -3,7 +3,7 @@ import os
 
 load_dotenv()
 
-from src.checker import send_notification
+from src.checker import send_notification, flush_notifications
 
 
 def main():
@@ -11,6 +11,8 @@ def main():
     subject = "[doctor-playwright] Test email"
     body = "Este es un correo de prueba enviado por el script doctor-playwright. Si lo recibes, la configuración SMTP funciona."
     send_notification(f"{subject}\n\n{body}")
+    # sends happen on a background thread; wait before the process exits
+    flush_notifications()
     print("Intenté enviar el correo. Revisa tu bandeja de entrada y spam.")
 
 
@@ -0,0 +1,76 @@
+"""Streaming access to slots_*.json artifacts.
+
+Yields slots one at a time so large artifacts never materialize as a full
+Python list. Streaming has constant overhead, so small files (and
+environments without ijson) take the plain full-load path instead.
+"""
+import os
+import json
+
+try:
+    import ijson
+except Exception:  # ijson is optional; full json load is the fallback
+    ijson = None
+
+try:
+    import orjson
+except Exception:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# below this size a full load is faster than streaming
+SMALL_FILE_BYTES = 1 << 20
+
+
+def iter_slots(path):
+    """Yield slot dicts from a slots_*.json artifact."""
+    if ijson is None or os.path.getsize(path) < SMALL_FILE_BYTES:
+        with open(path, "rb") as fh:
+            data = _loads(fh.read())
+        # keep only the slots list alive while the caller consumes it; the
+        # rest of the document (grouped index, url, ...) is freed up front
+        slots = data.get("slots", [])
+        del data
+        yield from slots
+        return
+    with open(path, "rb") as fh:
+        yield from ijson.items(fh, "slots.item")
+
+
+def iter_slots_for(path, target):
+    """Yield only the slots relevant to target, preferring the grouped index.
+
+    Newer artifacts carry a slots_by_doctor map, so one doctor's slots are
+    found by matching k doctor names instead of scanning n slots. Older
+    artifacts (or huge streamed ones) fall back to the flat list; callers
+    still apply their own doctor filter.
+
+    No ordering guarantee: when several name variants match the target
+    (e.g. differing case), their groups are concatenated in map order, so
+    callers must pick the best slot themselves rather than take the first
+    (find_next_slot_iter tracks the minimum for exactly this reason).
+    """
+    if ijson is None or os.path.getsize(path) < SMALL_FILE_BYTES:
+        with open(path, "rb") as fh:
+            data = _loads(fh.read())
+        by_doctor = data.get("slots_by_doctor")
+        if by_doctor:
+            # collect the matching groups, then release the document so only
+            # the target's slots stay resident while the caller iterates
+            t = target.lower()
+            groups = [g for name, g in by_doctor.items() if t in name.lower()]
+            del data, by_doctor
+            for group in groups:
+                yield from group
+            return
+        slots = data.get("slots", [])
+        del data
+        yield from slots
+        return
+    with open(path, "rb") as fh:
+        yield from ijson.items(fh, "slots.item")
@@ -10,10 +10,13 @@ and update `state.json`.
 import os
 import sys
 import json
-import glob
 import time
 import logging
+import argparse
+import tempfile
+import threading
 
+from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -24,37 +27,101 @@ except Exception:
     # fallback: try to import as package
     import src.checker as checker
 
+try:
+    from stream_slots import iter_slots_for
+except Exception:
+    from tools.stream_slots import iter_slots_for
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
+try:
+    import orjson
+except Exception:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj):
+    """Indented JSON bytes, via orjson's C encoder when present."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _canon(obj):
+    """Canonical (sorted-keys) serialization, for change detection."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+
+def scan_artifacts(artifacts_dir):
+    """One directory pass: newest slots file plus CAPTCHA artifact detection.
+
+    Returns (latest_slots_path_or_None, captcha_detected). slots_<epoch>.json
+    names sort chronologically, so the max is found by name without stat.
+    Scans in bytes mode: prefix/suffix checks on raw names skip the
+    str-decode of every entry; only the winner is decoded.
+    """
+    best = None
+    captcha_detected = False
+    try:
+        with os.scandir(os.fsencode(artifacts_dir)) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(b"slots_") and name.endswith(b".json"):
+                    if entry.is_file() and (best is None or name > best):
+                        best = name
+                elif not captcha_detected and name.startswith(b"submit_failure_") and name.endswith(b".html"):
+                    captcha_detected = True
+    except FileNotFoundError:
+        return None, False
+    latest = os.path.join(artifacts_dir, os.fsdecode(best)) if best else None
+    return latest, captcha_detected
+
 
 def find_latest_slots(artifacts_dir):
-    files = glob.glob(os.path.join(artifacts_dir, "slots_*.json"))
-    if not files:
-        return None
-    files.sort(key=os.path.getmtime, reverse=True)
-    return files[0]
+    # kept for callers that only need the newest slots file
+    return scan_artifacts(artifacts_dir)[0]
 
 
 def load_state(path):
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                return json.load(fh)
-        except Exception:
-            logging.exception("Failed to read state file")
-    return {}
+    # EAFP: open directly instead of an exists() probe, saving a stat call
+    # and the race between check and open
+    try:
+        with open(path, "rb") as fh:
+            return _loads(fh.read())
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logging.exception("Failed to read state file")
+        return {}
+
+
+# parent directories already created this process; skips makedirs per write
+_ensured_dirs = set()
 
 
 def save_state(path, data):
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        # Write atomically: write to a temp file then replace
-        tmp_path = f"{path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
+        parent = os.path.dirname(path) or "."
+        if parent not in _ensured_dirs:
+            os.makedirs(parent, exist_ok=True)
+            _ensured_dirs.add(parent)
+        # serialize once, then write atomically: a uniquely-named temp file
+        # in the same directory followed by os.replace, so a killed run can
+        # never leave a truncated state.json behind
+        payload = _dumps(data)
+        with tempfile.NamedTemporaryFile(dir=parent, prefix=".state-", suffix=".tmp", delete=False) as fh:
+            fh.write(payload)
             fh.flush()
             os.fsync(fh.fileno())
-        # atomic replace
+            tmp_path = fh.name
         os.replace(tmp_path, path)
         logging.info("Saved state file to %s (entries=%s)", path, list(data.keys()))
     except Exception:
@@ -62,8 +129,6 @@ def save_state(path, data):
 
 
 def main():
-    import argparse
-
     parser = argparse.ArgumentParser()
     parser.add_argument("--artifacts", default="./artifacts", help="Artifacts directory")
     parser.add_argument("--state-file", default="./artifacts/state.json", help="State file path")
@@ -72,26 +137,60 @@ def main():
     artifacts_dir = args.artifacts
     state_file = args.state_file
 
-    latest = find_latest_slots(artifacts_dir)
+    # bind env settings and frequently-used module attributes once; the
+    # script runs every minute in CI, so repeated dict lookups add up
+    env = os.environ
+    target = env.get("TARGET_DOCTOR")
+    max_days = int(env.get("MAX_DAYS", "30"))
+    failure_threshold = int(env.get("FAILURE_THRESHOLD", "3"))
+    pause_hours = int(env.get("PAUSE_DURATION_HOURS", "24"))
+    parse_slot_datetime = checker._parse_slot_datetime
+
+    # checker.send_notification only enqueues to its background worker, so
+    # sends never block the state write; dedupe repeats within this run and
+    # remember whether anything was queued so we know to flush before exit
+    queued_messages = set()
+
+    def send_notification(message):
+        if message in queued_messages:
+            logging.info("Skipping duplicate notification in this run")
+            return
+        queued_messages.add(message)
+        checker.send_notification(message)
+
+    def flush_notifications(timeout=30.0):
+        """Bounded wait for queued emails before this short-lived process exits."""
+        if not queued_messages:
+            return
+        done = threading.Event()
+
+        def _flush():
+            checker.flush_notifications()
+            done.set()
+
+        threading.Thread(target=_flush, daemon=True).start()
+        if not done.wait(timeout):
+            logging.warning("Timed out waiting for notification flush after %ss", timeout)
+
+    latest, captcha_detected = scan_artifacts(artifacts_dir)
     if not latest:
         logging.info("No slots JSON found in %s", artifacts_dir)
         return 0
 
-    try:
-        with open(latest, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
-    except Exception:
-        logging.exception("Failed reading latest slots file %s", latest)
-        return 2
-
-    target = os.getenv("TARGET_DOCTOR")
     if not target:
         logging.info("No TARGET_DOCTOR set in env; nothing to do")
         return 0
 
-    slots = data.get("slots", [])
-    next_slot = checker.find_next_slot(slots, target, int(os.getenv("MAX_DAYS", "30")))
     state = load_state(state_file)
+    # snapshot for change detection: the common outcome is "nothing changed",
+    # and rewriting an identical state file every CI run is wasted I/O
+    state_baseline = _canon(state)
+
+    def persist_state():
+        if _canon(state) != state_baseline:
+            save_state(state_file, state)
+        else:
+            logging.info("State unchanged; skipping write")
 
     # setup target entry
     saved = state.get(target, {})
@@ -100,26 +199,10 @@ def main():
     paused_until = saved.get("paused_until")
     failures = int(saved.get("consecutive_failures", 0))
 
-    new_hora = None
-    if next_slot:
-        new_hora = next_slot.get("HORA") or next_slot.get("hora") or next_slot.get("PROXIMA")
-
     def parse_dt(s):
-        return checker._parse_slot_datetime(s) if s else None
-
-    prev_dt = parse_dt(prev_hora)
-    new_dt = parse_dt(new_hora)
-
-    # Detect submit_failure / captcha artifacts: if the artifacts dir contains submit_failure files
-    captcha_detected = False
-    try:
-        import glob
+        return parse_slot_datetime(s) if s else None
 
-        fails = glob.glob(os.path.join(args.artifacts, "submit_failure_*.html"))
-        if fails:
-            captcha_detected = True
-    except Exception:
-        pass
+    # captcha_detected comes from the same scan_artifacts pass above
 
     # Update failure counters
     if captcha_detected:
@@ -129,14 +212,22 @@ def main():
         # reset failures if we didn't detect a captcha in this run
         failures = 0
 
-    # If we are paused due to previous CAPTCHAs, check paused_until
+    # If we are paused due to previous CAPTCHAs, check paused_until before
+    # doing any slot parsing: the common "still paused" tick exits without
+    # touching the slots artifact at all
     if paused:
-        from datetime import datetime
         if paused_until:
             try:
-                pu = datetime.fromisoformat(paused_until)
-                now = datetime.utcnow()
-                if now >= pu:
+                # paused_until is epoch seconds; older state files stored an
+                # ISO string, so coerce those through fromisoformat once
+                if isinstance(paused_until, (int, float)):
+                    pu_ts = float(paused_until)
+                else:
+                    pu = datetime.fromisoformat(paused_until)
+                    if pu.tzinfo is None:
+                        pu = pu.replace(tzinfo=timezone.utc)
+                    pu_ts = pu.timestamp()
+                if time.time() >= pu_ts:
                     # resume
                     logging.info("Resuming monitoring for %s (paused_until expired)", target)
                     paused = False
@@ -144,7 +235,7 @@ def main():
                     failures = 0
                     # send resume notification
                     try:
-                        checker.send_notification(f"Monitor resumed for {target}")
+                        send_notification(f"Monitor resumed for {target}")
                     except Exception:
                         logging.exception("Failed to send resume notification")
                 else:
@@ -152,21 +243,61 @@ def main():
                     # persist unchanged and exit
                     saved.update({"hora": prev_hora, "consecutive_failures": failures, "paused": paused, "paused_until": paused_until})
                     state[target] = saved
-                    save_state(state_file, state)
+                    persist_state()
                     return 0
             except Exception:
                 logging.exception("Failed parsing paused_until; keeping monitor paused")
                 saved.update({"hora": prev_hora, "consecutive_failures": failures, "paused": paused, "paused_until": paused_until})
                 state[target] = saved
-                save_state(state_file, state)
+                persist_state()
                 return 0
         else:
             logging.info("Monitoring paused for %s (paused flag set with no paused_until).", target)
             saved.update({"hora": prev_hora, "consecutive_failures": failures, "paused": paused})
             state[target] = saved
-            save_state(state_file, state)
+            persist_state()
             return 0
 
+    # result cache: identical artifact + query means identical answer, so
+    # repeat runs over an unchanged slots file skip the scan entirely
+    try:
+        cache_sig = [latest, os.stat(latest).st_mtime_ns, target, max_days]
+    except OSError:
+        cache_sig = None
+    if cache_sig is not None and saved.get("_cache_sig") == cache_sig:
+        # short-circuit the whole run when the bookkeeping is also a no-op:
+        # same artifact, no captcha this tick, and the failure/pause fields
+        # already hold what we would write back
+        if (
+            not captcha_detected
+            and not saved.get("paused", False)
+            and failures == int(saved.get("consecutive_failures", 0))
+        ):
+            logging.info("Slots artifact unchanged for %s; nothing to do", target)
+            return 0
+        next_slot = saved.get("raw")
+        logging.info("Slots artifact unchanged; reusing cached next slot for %s", target)
+    else:
+        # stream the artifact and stop at the first in-window match, instead
+        # of materializing every slot just to pick one
+        try:
+            next_slot = checker.find_next_slot_iter(iter_slots_for(latest, target), target, max_days)
+        except Exception:
+            logging.exception("Failed reading latest slots file %s", latest)
+            return 2
+        if cache_sig is not None:
+            saved["_cache_sig"] = cache_sig
+        # the tail persist writes `saved`, so keep the computed result next
+        # to its signature; the cache-hit branch reads this back as "raw"
+        saved["raw"] = next_slot
+
+    new_hora = None
+    if next_slot:
+        new_hora = next_slot.get("HORA") or next_slot.get("hora") or next_slot.get("PROXIMA")
+
+    prev_dt = parse_dt(prev_hora)
+    new_dt = parse_dt(new_hora)
+
     if new_dt and (not prev_dt or new_dt < prev_dt):
         # Determine if this is the first time we have a saved hora for this target
         is_first_setup = not prev_hora
@@ -175,29 +306,29 @@ def main():
             # current discovered slot so subsequent runs compare against it.
             logging.info("First run for %s: initializing state with %s (startup email suppressed)", target, new_hora)
             state[target] = {"hora": new_hora, "raw": next_slot, "consecutive_failures": 0, "paused": False}
-            save_state(state_file, state)
+            persist_state()
         else:
             # send notification only when an earlier slot appears compared to previously saved
             msg = f"Slot freed for {target}: {new_hora}. Previously: {prev_hora}"
             try:
-                checker.send_notification(msg)
+                send_notification(msg)
                 logging.info("Sent notification for %s", target)
             except Exception:
                 logging.exception("Failed to send notification via checker.send_notification")
             # update state
             state[target] = {"hora": new_hora, "raw": next_slot, "consecutive_failures": 0, "paused": False}
-            save_state(state_file, state)
+            persist_state()
     else:
         logging.info("No earlier slot for %s (found=%s saved=%s)", target, new_dt, prev_dt)
         # if captcha failures exceed threshold, pause and alert
-        FAILURE_THRESHOLD = int(os.getenv("FAILURE_THRESHOLD", "3"))
-        if failures >= FAILURE_THRESHOLD:
-            from datetime import datetime, timedelta, timezone
-            pause_hours = int(os.getenv("PAUSE_DURATION_HOURS", "24"))
-            pu = (datetime.now(timezone.utc) + timedelta(hours=pause_hours)).isoformat()
-            alert_msg = f"Monitor paused for {target}: detected {failures} consecutive submit failures/CAPTCHA. Paused until {pu}. Please check the site or increase backoff."
+        if failures >= failure_threshold:
+            # store epoch seconds: comparing against time.time() needs no
+            # datetime parsing on every paused tick
+            pu = int(time.time() + pause_hours * 3600)
+            pu_human = datetime.fromtimestamp(pu, timezone.utc).isoformat()
+            alert_msg = f"Monitor paused for {target}: detected {failures} consecutive submit failures/CAPTCHA. Paused until {pu_human}. Please check the site or increase backoff."
             try:
-                checker.send_notification(alert_msg)
+                send_notification(alert_msg)
                 logging.info("Sent CAPTCHA alert for %s", target)
             except Exception:
                 logging.exception("Failed to send CAPTCHA alert")
@@ -210,7 +341,8 @@ def main():
     current_hora = current_entry.get("hora", prev_hora)
     saved.update({"hora": current_hora, "consecutive_failures": failures, "paused": paused, "paused_until": paused_until})
     state[target] = saved
-    save_state(state_file, state)
+    persist_state()
+    flush_notifications()
 
     return 0
 